@@ -0,0 +1,148 @@
+"""
+test_validate.py
+
+Pins the behaviour of the validation demo. Run with `python -m unittest`.
+"""
+
+import contextlib
+import io
+import json
+import unittest
+from unittest import mock
+
+import validate
+from validate import validate_data_against_contract, validate_json_against_contract
+
+
+def run_validation(records, contract):
+    """Validates parsed records against a contract; returns (passed, printed output)."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed = validate_data_against_contract(records, contract, "Test")
+    return passed, output.getvalue()
+
+
+def run_json_validation(records, contract):
+    """Like run_validation, but through the raw JSON entry point."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed = validate_json_against_contract(json.dumps(records).encode(), contract, "Test")
+    return passed, output.getvalue()
+
+
+SEMANTIC_CONTRACT = {
+    "fields": {
+        "order_id": {"type": "string", "required": True},
+        "amt": {"type": "integer", "tags": {"unit": "cents"}},
+        "p": {"type": "number", "tags": {"unit": "full_unit"}},
+    },
+}
+
+
+class SemanticCoercionTest(unittest.TestCase):
+    """Values the schema layer would coerce still fail the semantic checks."""
+
+    cases = [
+        ({"order_id": "o-1", "amt": 5.0}, "Field 'amt' with unit 'cents' must be a int, but got float."),
+        ({"order_id": "o-1", "p": "1.5"}, "Field 'p' with unit 'full_unit' must be a float, but got str."),
+        ({"order_id": "o-1", "p": True}, "Field 'p' with unit 'full_unit' must be a float, but got bool."),
+        # bool is a subclass of int, so only an exact type check catches this one.
+        ({"order_id": "o-1", "amt": True}, "Field 'amt' with unit 'cents' must be a int, but got bool."),
+    ]
+
+    def assert_semantic_failures(self, run):
+        for record, message in self.cases:
+            with self.subTest(record=record):
+                passed, output = run([record], SEMANTIC_CONTRACT)
+                self.assertFalse(passed)
+                self.assertIn(f"Record o-1 FAILED Test semantic check: {message}", output)
+
+    def test_records(self):
+        self.assert_semantic_failures(run_validation)
+
+    def test_json(self):
+        self.assert_semantic_failures(run_json_validation)
+
+    @unittest.skipIf(validate.msgspec is None, "msgspec is not installed")
+    def test_json_msgspec(self):
+        # Contracts compiled without USE_MSGSPEC have no msgspec decoder.
+        validate._compile_contract_key.cache_clear()
+        self.addCleanup(validate._compile_contract_key.cache_clear)
+        with mock.patch.object(validate, "USE_MSGSPEC", True):
+            self.assert_semantic_failures(run_json_validation)
+
+
+class JsonInputTest(unittest.TestCase):
+    """The JSON entry point accepts what `json.load` accepts."""
+
+    def test_nan_is_a_schema_failure(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            passed = validate_json_against_contract(
+                b'[{"order_id": "o-1", "amt": NaN}]', SEMANTIC_CONTRACT, "Test"
+            )
+        self.assertFalse(passed)
+        self.assertIn("Record o-1 FAILED Test schema validation: amt:", output.getvalue())
+
+    def test_record_that_is_not_an_object(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            passed = validate_json_against_contract(
+                b'[{"order_id": "o-1"}, 5]', SEMANTIC_CONTRACT, "Test"
+            )
+        self.assertFalse(passed)
+        self.assertIn("Record N/A FAILED Test schema validation: record:", output.getvalue())
+
+
+class CheckOriginalRecordsTest(unittest.TestCase):
+    """The record checks see the records as given, not the schema validator's output."""
+
+    def test_rule_on_undeclared_key(self):
+        contract = {
+            "fields": {"a": {"type": "integer"}},
+            "quality_rules": [{"name": "b_positive", "expression": "b > 0"}],
+        }
+        passed, output = run_validation([{"a": 1, "b": 2}], contract)
+        self.assertTrue(passed, output)
+
+    def test_undeclared_order_id_in_failure(self):
+        contract = {
+            "fields": {"price": {"type": "number"}},
+            "quality_rules": [{"name": "price_positive", "expression": "price >= 0"}],
+        }
+        passed, output = run_validation([{"order_id": "ord-1", "price": -1.0}], contract)
+        self.assertFalse(passed)
+        self.assertIn("Record ord-1 FAILED Test quality rule 'price_positive'", output)
+
+
+
+class LargeBatchTest(unittest.TestCase):
+    """Failures in a large batch keep their record positions, as if checked one by one."""
+
+    def test_matches_records_checked_one_by_one(self):
+        contract = {
+            "fields": {
+                "order_id": {"type": "string", "required": True},
+                "p": {"type": "number", "tags": {"unit": "full_unit"}},
+            },
+            "quality_rules": [{"name": "p_positive", "expression": "p >= 0"}],
+        }
+        records = []
+        for i in range(5000):
+            price = [1.0, 100, -1.0, "x"][i % 4]  # valid, semantic, rule, schema
+            records.append({"order_id": f"o-{i}", "p": price})
+
+        with mock.patch("os.cpu_count", return_value=4):
+            passed, output = run_validation(records, contract)
+
+        expected = [
+            line for record in records
+            for line in run_validation([record], contract)[1].splitlines() if "FAILED" in line
+        ]
+        self.assertFalse(passed)
+        self.assertEqual([line for line in output.splitlines() if "FAILED" in line], expected)
+        self.assertEqual(len(expected), 3750)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,22 +9,62 @@ to validate JSON data records. It is designed to show how a semantic
 contract can catch business logic errors that a simple schema check would miss.
 """
 
+import ast
+import builtins
+import functools
 import json
+import keyword
+import operator
+import os
 import yaml
-from typing import Any, Dict, List, Type
+from typing import (
+    Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+)
 
-from pydantic import BaseModel, ValidationError, create_model
+from pydantic_core import CoreSchema, SchemaValidator, ValidationError, core_schema
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; see USE_MSGSPEC below
+    msgspec = None
+
+try:
+    # orjson parses JSON several times faster than the standard library.
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional
+    from json import loads as json_loads
 
 # --- Constants ---
 
-# A mapping of contract-defined type strings to their Python equivalents.
-TYPE_MAPPING: Dict[str, Type] = {
+# A mapping of contract-defined type strings to the pydantic-core schemas enforcing them.
+TYPE_MAPPING: Dict[str, Callable[[], CoreSchema]] = {
+    "string": core_schema.str_schema,
+    # A "smart" union keeps ints as ints, so the semantic checks can still tell 1999 from 19.99.
+    "number": lambda: core_schema.union_schema(
+        [core_schema.float_schema(), core_schema.int_schema()]
+    ),
+    "integer": core_schema.int_schema,
+    "boolean": core_schema.bool_schema,
+}
+
+# The Python types msgspec decodes each contract type into (see USE_MSGSPEC).
+MSGSPEC_TYPE_MAPPING: Dict[str, Any] = {
     "string": str,
-    "number": float | int,
+    "number": int | float,
     "integer": int,
     "boolean": bool,
 }
 
+# Set USE_MSGSPEC=1 (with msgspec installed) to decode and schema-check raw JSON
+# records with msgspec Structs instead of pydantic-core. Any decode error falls
+# back to the pydantic-core path, which takes care of reporting it.
+USE_MSGSPEC = os.getenv("USE_MSGSPEC") == "1" and msgspec is not None
+
 # A mapping of semantic 'unit' tags to the strictly enforced Python type.
 # This is the core of the semantic type validation.
 SEMANTIC_TYPE_MAP: Dict[str, Type] = {
@@ -32,6 +72,50 @@ SEMANTIC_TYPE_MAP: Dict[str, Type] = {
     "cents": int,
 }
 
+# Globals for quality rule evaluation, shared instead of rebuilt on every eval() call.
+# Builtins stay available, so rules like `len(order_id) > 0` keep working.
+_RULE_GLOBALS: Dict[str, Any] = {"__builtins__": builtins}
+
+# Comparison operators that simple rules (`field > 0`, `field is not None`) are
+# turned into, instead of going through eval().
+_COMPARISON_OPERATORS: Dict[Type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+RuleCheck = Callable[[Dict[str, Any]], Any]
+
+# The outcome of the generated per-record check: None for a valid record, otherwise
+# (kind, position, detail) for its first failure; `kind` is one of "semantic",
+# "rule" or "error", and `position` indexes the matching semantic check or rule.
+RecordFailure = Tuple[str, int, Any]
+RecordCheck = Callable[[Dict[str, Any]], Optional[RecordFailure]]
+
+
+class CompiledContract(NamedTuple):
+    """A contract pre-processed once, so that per-record validation stays cheap."""
+
+    # Validates a whole list of records (parsed or raw JSON) in a single call.
+    list_validator: SchemaValidator
+    # One entry per field tagged with a semantic unit, as parallel tuples. They feed
+    # the generated check and describe its failures; the position in a
+    # ('semantic', position, value) failure indexes into them.
+    field_names: Tuple[str, ...]
+    expected_types: Tuple[Type, ...]
+    unit_names: Tuple[str, ...]
+    # (rule_name, expression, check) for every quality rule.
+    compiled_rules: List[Tuple[str, str, RuleCheck]]
+    # All of the above, generated into a single function specialized for this contract.
+    check_record: RecordCheck
+    # Decodes a raw JSON array of records when USE_MSGSPEC is set, None otherwise.
+    msgspec_decoder: Optional[Any]
+
 
 # --- Helper for Colored Console Output ---
 
@@ -43,86 +127,325 @@ def print_color(text: str, color: str) -> None:
 
 # --- Core Logic ---
 
-def create_pydantic_model_from_contract(contract: Dict[str, Any]) -> Type[BaseModel]:
-    """
-    Dynamically creates a Pydantic model from a data contract dictionary.
+# The contract being compiled, by signature: contracts aren't hashable, so the
+# cached builder takes the signature and looks the contract itself up here.
+_CONTRACTS_BY_KEY: Dict[str, Dict[str, Any]] = {}
+
 
-    The model enforces basic types and whether a field is required.
+def _contract_key(contract: Dict[str, Any]) -> str:
     """
+    Returns a hashable signature of a contract. Key order is kept, since field
+    and rule order decide which failure of a record is reported first.
+    """
+    return yaml.dump(contract, Dumper=SafeDumper, sort_keys=False)
+
+
+def _record_schema(contract: Dict[str, Any]) -> CoreSchema:
+    """Builds the typed dict core schema of a single record."""
     fields: Dict[str, Any] = {}
     for field_name, attributes in contract.get("fields", {}).items():
         field_type_str = attributes.get("type", "string")
-        python_type = TYPE_MAPPING.get(field_type_str, str)
+        field_schema = TYPE_MAPPING.get(field_type_str, core_schema.str_schema)()
 
         if attributes.get("required", False):
-            # Ellipsis (...) marks the field as mandatory in Pydantic.
-            field_definition = (python_type, ...)
+            fields[field_name] = core_schema.typed_dict_field(field_schema, required=True)
         else:
-            # Provide a default value of None to make the field optional.
-            field_definition = (python_type | None, None)
+            # Optional fields may be missing or null; missing ones are left out of the output.
+            fields[field_name] = core_schema.typed_dict_field(
+                core_schema.nullable_schema(field_schema), required=False
+            )
 
-        fields[field_name] = field_definition
+    return core_schema.typed_dict_schema(fields)
 
-    return create_model("DynamicContractModel", **fields)
 
+def _create_msgspec_decoder(contract: Dict[str, Any]) -> "msgspec.json.Decoder":
+    """Creates a msgspec decoder for a JSON array of records, built from a Struct per contract."""
+    fields = []
+    for position, (field_name, attributes) in enumerate(contract.get("fields", {}).items()):
+        field_type = MSGSPEC_TYPE_MAPPING.get(attributes.get("type", "string"), str)
 
-def _is_record_valid(
-        record: Dict[str, Any],
-        contract: Dict[str, Any],
-        pydantic_model: Type[BaseModel],
-        contract_name: str,
-) -> bool:
-    """
-    Performs a full validation of a single data record against a contract.
-    Returns True if the record is valid, False otherwise.
+        # Struct attributes must be identifiers; other names are mapped onto one.
+        attribute = field_name
+        if not field_name.isidentifier() or keyword.iskeyword(field_name):
+            attribute = f"field_{position}"
+
+        if attributes.get("required", False):
+            fields.append((attribute, field_type, msgspec.field(name=field_name)))
+        else:
+            # UNSET (rather than None) keeps missing fields out of `to_builtins()`.
+            fields.append((
+                attribute,
+                field_type | None | msgspec.UnsetType,
+                msgspec.field(default=msgspec.UNSET, name=field_name),
+            ))
+
+    # Unknown fields are an error rather than dropped, so decoded records keep every key.
+    record_struct = msgspec.defstruct(
+        "DynamicContractStruct", fields, kw_only=True, forbid_unknown_fields=True
+    )
+    return msgspec.json.Decoder(List[record_struct])
+
+
+def _compile_contract(contract: Dict[str, Any]) -> CompiledContract:
     """
-    record_id = record.get("order_id", "N/A")
+    Compiles a contract into a CompiledContract.
 
-    # 1. Basic Schema Validation (using the generated Pydantic model)
+    The result is cached per contract, so N records pay the validator build,
+    the field traversal and the rule compilation cost only once.
+    """
+    contract_key = _contract_key(contract)
+    _CONTRACTS_BY_KEY[contract_key] = contract
     try:
-        pydantic_model(**record)
-    except ValidationError as e:
-        print_color(f"Record {record_id} FAILED {contract_name} schema validation: {e}", "red")
-        return False
+        return _compile_contract_key(contract_key)
+    finally:
+        del _CONTRACTS_BY_KEY[contract_key]
 
-    # 2. Explicit Semantic Validation (the key part of the demo)
-    for field_name, attributes in contract.get("fields", {}).items():
-        if field_name not in record:
-            continue
 
-        tags = attributes.get("tags", {})
-        value = record[field_name]
-
-        # Check if a semantic unit requires a strict type.
-        expected_type = SEMANTIC_TYPE_MAP.get(tags.get("unit"))
-        if expected_type and not isinstance(value, expected_type):
-            print_color(
-                f"Record {record_id} FAILED {contract_name} semantic check: "
-                f"Field '{field_name}' with unit '{tags['unit']}' must be a "
-                f"{expected_type.__name__}, but got {type(value).__name__}.",
-                "red"
-            )
-            return False
+@functools.lru_cache(maxsize=32)
+def _compile_contract_key(contract_key: str) -> CompiledContract:
+    contract = _CONTRACTS_BY_KEY[contract_key]
 
-    # 3. Quality Rules Validation (using eval for dynamic rule execution)
+    field_names, expected_types, unit_names = [], [], []
+    for field_name, attributes in contract.get("fields", {}).items():
+        unit = attributes.get("tags", {}).get("unit")
+        expected_type = SEMANTIC_TYPE_MAP.get(unit)
+        if expected_type:
+            field_names.append(field_name)
+            expected_types.append(expected_type)
+            unit_names.append(unit)
+
+    compiled_rules = []
     for rule in contract.get("quality_rules", []):
+        if "expression" in rule:
+            check = _compile_rule(rule["name"], rule["expression"])
+        else:
+            # Dataset-level rules (e.g. `is_unique`) have no row expression: like the
+            # original `rule["expression"]` lookup, they fail every record.
+            check = _make_failing_check(KeyError("expression"))
+        compiled_rules.append((rule["name"], rule.get("expression"), check))
+
+    return CompiledContract(
+        list_validator=SchemaValidator(core_schema.list_schema(_record_schema(contract))),
+        field_names=tuple(field_names),
+        expected_types=tuple(expected_types),
+        unit_names=tuple(unit_names),
+        compiled_rules=compiled_rules,
+        check_record=_generate_record_check(field_names, expected_types, compiled_rules),
+        msgspec_decoder=_create_msgspec_decoder(contract) if USE_MSGSPEC else None,
+    )
+
+
+def _generate_record_check(
+        field_names: List[str],
+        expected_types: List[Type],
+        compiled_rules: List[Tuple[str, str, RuleCheck]],
+) -> RecordCheck:
+    """
+    Generates a function running every semantic and quality check of a contract
+    on a record, in a single pass.
+
+    The loops over the contract's fields and rules are unrolled at compile time,
+    so that checking a record is one straight-line function call, e.g.:
+
+        def check_record(record):
+            value = record.get('total_price')
+            if value is not None and type(value) is not _type_0:
+                return ('semantic', 0, value)
+            try:
+                if not _rule_0(record):
+                    return ('rule', 0, None)
+            except Exception as e:
+                return ('error', 0, e)
+            return None
+    """
+    namespace: Dict[str, Any] = {}
+    lines = ["def check_record(record):"]
+
+    # 1. Explicit Semantic Validation (the key part of the demo). Units map to leaf
+    # types (int, float), so an identity check on the exact type replaces isinstance();
+    # this also stops a bool from passing as `cents`. Missing or null values are left
+    # to the schema, which decides whether the field is required.
+    for position, (field_name, expected_type) in enumerate(zip(field_names, expected_types)):
+        namespace[f"_type_{position}"] = expected_type
+        lines += [
+            f"    value = record.get({field_name!r})",
+            f"    if value is not None and type(value) is not _type_{position}:",
+            f"        return ('semantic', {position}, value)",
+        ]
+
+    # 2. Quality Rules Validation (using the pre-compiled rule checks)
+    for position, (_, _, check) in enumerate(compiled_rules):
+        namespace[f"_rule_{position}"] = check
+        lines += [
+            "    try:",
+            f"        if not _rule_{position}(record):",
+            f"            return ('rule', {position}, None)",
+            "    except Exception as e:",
+            f"        return ('error', {position}, e)",
+        ]
+
+    lines.append("    return None")
+    exec(compile("\n".join(lines), "<contract>", "exec"), namespace)
+    return namespace["check_record"]
+
+
+def _compile_rule(rule_name: str, expression: str) -> RuleCheck:
+    """
+    Compiles a quality rule expression into a function of a record.
+
+    Simple `field <op> constant` comparisons become a plain operator call;
+    anything else is compiled once and evaluated with the record as locals.
+    """
+    try:
+        tree = ast.parse(expression, f"<rule:{rule_name}>", "eval")
+    except SyntaxError as e:
+        # A malformed rule fails every record with its syntax error, as eval() would.
+        return _make_failing_check(e)
+    node = tree.body
+
+    if (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and type(node.ops[0]) in _COMPARISON_OPERATORS
+        and isinstance(node.left, ast.Name)
+        and isinstance(node.comparators[0], ast.Constant)
+    ):
+        return _make_comparison_check(
+            node.left.id, _COMPARISON_OPERATORS[type(node.ops[0])], node.comparators[0].value
+        )
+
+    # WARNING: eval() is used here for demonstration purposes.
+    # In a production system, use a safer expression evaluation library.
+    code = compile(tree, f"<rule:{rule_name}>", "eval")
+    return functools.partial(eval, code, _RULE_GLOBALS)
+
+
+def _make_failing_check(error: Exception) -> RuleCheck:
+    def check(record: Dict[str, Any]) -> Any:
+        # A fresh exception per record, so tracebacks don't pile up on a shared one.
+        raise type(error)(*error.args)
+
+    return check
+
+
+def _make_comparison_check(
+        field_name: str, compare: Callable[[Any, Any], Any], constant: Any
+) -> RuleCheck:
+    def check(record: Dict[str, Any]) -> Any:
         try:
-            # WARNING: eval() is used here for demonstration purposes.
-            # In a production system, use a safer expression evaluation library.
-            if not eval(rule["expression"], {}, record):
-                print_color(
-                    f"Record {record_id} FAILED {contract_name} quality rule "
-                    f"'{rule['name']}': Expression '{rule['expression']}' is false.",
-                    "red"
-                )
-                return False
-        except Exception as e:
-            print_color(
-                f"Could not evaluate rule '{rule['name']}' on record {record_id}: {e}", "red"
+            value = record[field_name]
+        except KeyError:
+            # Fail the same way eval() would on an unknown name.
+            raise NameError(f"name '{field_name}' is not defined") from None
+        return compare(value, constant)
+
+    return check
+
+
+def _validate_schema(
+        data_records: List[Dict[str, Any]], compiled: CompiledContract, contract_name: str
+) -> Dict[int, str]:
+    """
+    Performs basic schema validation (using the generated pydantic-core validator).
+
+    The whole batch is validated in a single pydantic-core call; errors are then
+    mapped back to their records through the list index at the start of `loc`.
+    Returns a failure message for every record index that doesn't match the schema.
+    The validator's (coerced) output is discarded: the semantic checks must see the
+    original values, or 5.0 would pass as an integer.
+    """
+    try:
+        compiled.list_validator.validate_python(data_records)
+        return {}
+    except ValidationError as e:
+        errors_by_index: Dict[int, List[str]] = {}
+        for error in e.errors():
+            index, *field_loc = error["loc"]
+            location = ".".join(str(part) for part in field_loc) or "record"
+            errors_by_index.setdefault(index, []).append(f"{location}: {error['msg']}")
+
+        failures = {}
+        for index, messages in errors_by_index.items():
+            record = data_records[index]
+            # A record that isn't an object at all fails with a record-level error.
+            record_id = record.get("order_id", "N/A") if isinstance(record, dict) else "N/A"
+            failures[index] = (
+                f"Record {record_id} FAILED {contract_name} "
+                f"schema validation: {'; '.join(messages)}"
             )
-            return False
+        return failures
+
+
+def _find_record_failures(
+        data_records: List[Dict[str, Any]],
+        compiled: CompiledContract,
+        contract_name: str,
+        failures: Dict[int, str],
+) -> None:
+    """
+    Runs the semantic and quality checks over a batch of schema-valid records.
+
+    Each record goes through the contract's generated check function once; only
+    the first failure of each record is kept. Records already present in
+    `failures` are skipped.
+    """
+    check_record = compiled.check_record
+    for index, record in enumerate(data_records):
+        if index in failures:
+            continue
+        failure = check_record(record)
+        if failure is not None:
+            failures[index] = _describe_failure(failure, record, compiled, contract_name)
+
+
+def _describe_failure(
+        failure: RecordFailure,
+        record: Dict[str, Any],
+        compiled: CompiledContract,
+        contract_name: str,
+) -> str:
+    """Turns the outcome of a generated record check into a readable message."""
+    kind, position, detail = failure
+    record_id = record.get("order_id", "N/A")
+
+    if kind == "semantic":
+        return (
+            f"Record {record_id} FAILED {contract_name} semantic check: "
+            f"Field '{compiled.field_names[position]}' with unit "
+            f"'{compiled.unit_names[position]}' must be a "
+            f"{compiled.expected_types[position].__name__}, but got {type(detail).__name__}."
+        )
+
+    rule_name, expression, _ = compiled.compiled_rules[position]
+    if kind == "rule":
+        return (
+            f"Record {record_id} FAILED {contract_name} "
+            f"quality rule '{rule_name}': Expression '{expression}' is false."
+        )
+
+    return f"Could not evaluate rule '{rule_name}' on record {record_id}: {detail}"
+
 
-    return True
+def _report_failures(failures: Dict[int, str], contract_name: str) -> bool:
+    """Prints failures in record order. Returns True if there were none."""
+    for index in sorted(failures):
+        print_color(failures[index], "red")
+
+    all_records_valid = not failures
+
+    if all_records_valid:
+        print_color(f"All records PASSED {contract_name} validation. ✅", "green")
+
+    return all_records_valid
+
+
+def _validate_records(
+        data_records: List[Dict[str, Any]], compiled: CompiledContract, contract_name: str
+) -> bool:
+    """Runs the schema, semantic and quality checks over every record and reports the outcome."""
+    failures = _validate_schema(data_records, compiled, contract_name)
+    _find_record_failures(data_records, compiled, contract_name, failures)
+    return _report_failures(failures, contract_name)
 
 
 def validate_data_against_contract(
@@ -134,20 +457,49 @@ def validate_data_against_contract(
     """
     print_color(f"\n--- Running Validation with {contract_name} Contract ---", "yellow")
 
-    pydantic_model = create_pydantic_model_from_contract(contract)
+    compiled = _compile_contract(contract)
+    return _validate_records(data_records, compiled, contract_name)
 
-    # Use a list comprehension to check all records and collect results.
-    results = [
-        _is_record_valid(record, contract, pydantic_model, contract_name)
-        for record in data_records
-    ]
 
-    all_records_valid = all(results)
+def _parse_json(raw_data: bytes) -> Any:
+    """
+    Parses raw JSON. Input that orjson rejects but the json module accepts (NaN and
+    Infinity) is handed to the latter, so such records still reach the checks.
+    """
+    try:
+        return json_loads(raw_data)
+    except ValueError:
+        return json.loads(raw_data)
 
-    if all_records_valid:
-        print_color(f"All records PASSED {contract_name} validation. ✅", "green")
 
-    return all_records_valid
+def validate_json_against_contract(
+        raw_data: bytes, contract: Dict[str, Any], contract_name: str
+) -> bool:
+    """
+    Validates a raw JSON array of data records against a data contract.
+
+    The semantic checks need the values exactly as sent, so the records are parsed
+    as-is (with orjson when installed) rather than taken from pydantic-core's
+    coercing JSON validator. With USE_MSGSPEC set, msgspec decodes and schema-checks
+    them in one pass instead; it is strict and forbids unknown fields, so its
+    output matches the input whenever the decode succeeds.
+    """
+    print_color(f"\n--- Running Validation with {contract_name} Contract ---", "yellow")
+
+    compiled = _compile_contract(contract)
+
+    if USE_MSGSPEC:
+        try:
+            records = compiled.msgspec_decoder.decode(raw_data)
+        except msgspec.DecodeError:
+            pass  # Let the pydantic-core path below find and report the errors.
+        else:
+            # The record checks work on mappings, so turn the Structs back into dicts.
+            failures: Dict[int, str] = {}
+            _find_record_failures(msgspec.to_builtins(records), compiled, contract_name, failures)
+            return _report_failures(failures, contract_name)
+
+    return _validate_records(_parse_json(raw_data), compiled, contract_name)
 
 
 # --- Main Execution Block ---
@@ -159,17 +511,17 @@ def main():
     print("Analyzing data that is schema-valid but semantically incorrect...")
 
     with open("contract_v1_schema_only.yaml", "r") as f:
-        contract_v1 = yaml.safe_load(f)
+        contract_v1 = yaml.load(f, Loader=SafeLoader)
 
     with open("contract_v2_semantic.yaml", "r") as f:
-        contract_v2 = yaml.safe_load(f)
+        contract_v2 = yaml.load(f, Loader=SafeLoader)
 
-    with open("data/bad_data_semantic_error.json", "r") as f:
-        bad_data = json.load(f)
+    with open("data/bad_data_semantic_error.json", "rb") as f:
+        bad_data = f.read()
 
     # Run validations for both contracts.
-    v1_passed = validate_data_against_contract(bad_data, contract_v1, "V1 (Schema-Only)")
-    v2_passed = validate_data_against_contract(bad_data, contract_v2, "V2 (Semantic)")
+    v1_passed = validate_json_against_contract(bad_data, contract_v1, "V1 (Schema-Only)")
+    v2_passed = validate_json_against_contract(bad_data, contract_v2, "V2 (Semantic)")
 
     # Print final summary.
     print("\n" + "=" * 60)
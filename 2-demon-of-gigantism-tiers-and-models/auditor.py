@@ -5,14 +5,36 @@ A script that acts as a "Data Governance Auditor".
 It scans a directory of data contracts and reports on their characteristics,
 highlighting the difference in rigor between Gold, Silver, and Bronze tiers.
 """
+import functools
+import json
+import os
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from rich.console import Console
 from rich.table import Table
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used instead.
+    orjson = None
+
+# Contract sets larger than this are audited in a process pool. A file audits in
+# about 0.25 ms, while starting the pool costs ~10 ms (fork) to ~200 ms (spawn,
+# the default on macOS and Windows), so only large sets make up for it.
+PARALLEL_MIN_FILES = 1000
+
+# Parsed contracts are cached here as JSON, which is much cheaper to load than YAML.
+CACHE_DIR = Path(".cache")
+
 # --- Data Structure for Audit Results ---
 
 @dataclass
@@ -25,6 +47,10 @@ class AuditResult:
     sla: str
     guarantees: str
 
+
+class ContractAuditError(Exception):
+    """Raised when a contract file cannot be read or parsed."""
+
 # --- Core Logic: Parsing and Auditing ---
 
 def _parse_gold_silver_contract(
@@ -69,25 +95,82 @@ def _parse_bronze_contract(file_path: Path) -> AuditResult:
     )
 
 
+def _json_dumps(data: Dict) -> bytes:
+    return orjson.dumps(data) if orjson else json.dumps(data).encode()
+
+
+def _json_loads(raw: bytes) -> Dict:
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def load_contract_data(file_path: Path) -> Dict:
+    """
+    Loads a YAML contract, going through an on-disk JSON cache.
+
+    The YAML is only re-parsed when the contract is newer than its cached copy.
+    """
+    return _load_contract_data(file_path, file_path.stat().st_mtime)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_contract_data(file_path: Path, mtime: float) -> Dict:
+    cache_path = CACHE_DIR / file_path.relative_to(file_path.anchor)
+    cache_path = cache_path.with_suffix(cache_path.suffix + ".json")
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= mtime:
+        try:
+            return _json_loads(cache_path.read_bytes())
+        except ValueError:
+            pass  # A corrupt cache entry is simply rebuilt below.
+
+    # Contracts are small: one read, then parse the whole string at once.
+    contract_data = yaml.load(file_path.read_text(), Loader=SafeLoader)
+
+    try:
+        raw = _json_dumps(contract_data)
+        # Only cache what reads back unchanged: JSON would turn dates into strings
+        # (orjson) and int keys into string keys (json), so such contracts skip the cache.
+        if _json_loads(raw) == contract_data:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(raw)
+    except (OSError, TypeError):  # Unwritable cache, or not JSON-serializable
+        pass
+
+    return contract_data
+
+
 def audit_contract_file(file_path: Path) -> Optional[AuditResult]:
     """
     Audits a single contract file, routing to the correct parser.
-    Returns an AuditResult or None if parsing fails.
+    Returns an AuditResult, or None for unsupported files.
+    Raises ContractAuditError if the file cannot be read or parsed.
     """
     try:
         if file_path.suffix == ".md":
             return _parse_bronze_contract(file_path)
 
         if file_path.suffix in [".yaml", ".yml"]:
-            with file_path.open("r") as f:
-                contract_data = yaml.safe_load(f)
+            contract_data = load_contract_data(file_path)
             return _parse_gold_silver_contract(file_path, contract_data)
 
     except (IOError, yaml.YAMLError) as e:
-        print_color(f"Error processing file {file_path.name}: {e}", "red")
+        raise ContractAuditError(f"Error processing file {file_path.name}: {e}") from e
 
     return None
 
+
+def _audit_contract_file_in_worker(
+    file_path: Path,
+) -> Union[AuditResult, ContractAuditError, None]:
+    """
+    Process pool entry point for audit_contract_file.
+    Returns errors instead of raising them, so one bad file doesn't abort the whole map().
+    """
+    try:
+        return audit_contract_file(file_path)
+    except ContractAuditError as e:
+        return e
+
 # --- Presentation Logic ---
 
 def create_report_table(audit_results: List[AuditResult]) -> Table:
@@ -130,10 +213,23 @@ def main():
         console.print("[bold red]No contract files (.yaml, .yml, .md) found![/bold red]")
         return
 
-    # Process files and filter out any that failed to parse
-    audit_results = [
-        result for path in contract_files if (result := audit_contract_file(path))
-    ]
+    if len(contract_files) <= PARALLEL_MIN_FILES or (os.cpu_count() or 1) == 1:
+        outcomes = [_audit_contract_file_in_worker(path) for path in contract_files]
+    else:
+        # Audit files in parallel: each one is independent, CPU-bound parsing work.
+        with ProcessPoolExecutor() as executor:
+            outcomes = list(
+                executor.map(_audit_contract_file_in_worker, contract_files, chunksize=8)
+            )
+
+    # Report files that failed to parse and keep the rest
+    audit_results = []
+    for outcome in outcomes:
+        if isinstance(outcome, ContractAuditError):
+            # Parser messages may contain brackets, so don't interpret them as markup.
+            console.print(str(outcome), style="bold red", markup=False)
+        elif outcome:
+            audit_results.append(outcome)
 
     report_table = create_report_table(audit_results)
     console.print(report_table)
@@ -0,0 +1,48 @@
+"""
+contracts_compile.py
+
+An optional, offline step for the Data Governance Auditor.
+It pre-compiles every YAML contract into the auditor's JSON cache (see
+`auditor.load_contract_data`), so that audit runs don't parse any YAML at all.
+Contracts that haven't changed since their last compilation are skipped.
+Exits with status 1 if any contract could not be compiled.
+"""
+import sys
+from pathlib import Path
+
+import yaml
+from rich.console import Console
+
+from auditor import CACHE_DIR, load_contract_data
+
+
+def main():
+    """Finds all YAML contracts and makes sure each one has a fresh cache entry."""
+    console = Console()
+    console.print("[bold yellow]--- Compiling Data Contracts ---[/bold yellow]")
+
+    contract_files = sorted(
+        p for p in Path("contracts").glob("**/*") if p.suffix in [".yaml", ".yml"]
+    )
+
+    failed = 0
+    for path in contract_files:
+        try:
+            load_contract_data(path)
+        except (OSError, yaml.YAMLError) as e:
+            # Parser messages may contain brackets, so don't interpret them as markup.
+            console.print(f"❌ Error compiling {path}: {e}", style="bold red", markup=False)
+            failed += 1
+            continue
+        console.print(f"✅ [cyan]{path}[/cyan]")
+
+    compiled = len(contract_files) - failed
+    console.print(f"Compiled {compiled} contract(s) into [cyan]{CACHE_DIR}/[/cyan]")
+
+    if failed:
+        console.print(f"[bold red]{failed} contract(s) failed to compile.[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,68 @@ A simple script to detect breaking changes between two data contract versions.
 
 Usage:
 python breaking_change_detector.py <path_to_old_contract> <path_to_new_contract>
+python breaking_change_detector.py --write-sidecar <path_to_contract> [...]
+
+A contract may have a `<name>.fields.txt` sidecar: its sorted field names, one
+per line, under a header holding the SHA-256 of the contract file. When that
+fingerprint matches, the field names are read from the sidecar and the YAML is
+not parsed at all. A stale or missing sidecar falls back to parsing the YAML.
 """
+import hashlib
+import os
 import sys
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader
+
+
+SIDECAR_HEADER = "# sha256: "
+
+
+def _sidecar_path(contract_path):
+    return os.path.splitext(contract_path)[0] + ".fields.txt"
+
+
+def _fingerprint(raw_contract):
+    return hashlib.sha256(raw_contract).hexdigest()
+
+
+def load_contract_fields(contract_path):
+    """Returns the set of field names of a contract, preferring a fresh sidecar."""
+    with open(contract_path, 'rb') as f:
+        raw_contract = f.read()
 
-def detect_breaking_changes(old_contract_path, new_contract_path):
     try:
-        with open(old_contract_path, 'r') as f:
-            old_contract = yaml.safe_load(f)
-        with open(new_contract_path, 'r') as f:
-            new_contract = yaml.safe_load(f)
+        with open(_sidecar_path(contract_path), 'r') as f:
+            header, *fields = f.read().splitlines()
+        if header == SIDECAR_HEADER + _fingerprint(raw_contract):
+            return set(fields)
+    except (FileNotFoundError, ValueError):
+        pass  # No usable sidecar: parse the contract itself.
 
-        old_fields = set(old_contract['fields'].keys())
-        new_fields = set(new_contract['fields'].keys())
+    contract = yaml.load(raw_contract, Loader=SafeLoader)
+    return set(contract['fields'].keys())
+
+
+def write_fields_sidecar(contract_path):
+    """Writes (or refreshes) the `.fields.txt` sidecar of a contract."""
+    with open(contract_path, 'rb') as f:
+        raw_contract = f.read()
+
+    contract = yaml.load(raw_contract, Loader=SafeLoader)
+    lines = [SIDECAR_HEADER + _fingerprint(raw_contract), *sorted(contract['fields'].keys())]
+
+    with open(_sidecar_path(contract_path), 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def detect_breaking_changes(old_contract_path, new_contract_path):
+    try:
+        old_fields = load_contract_fields(old_contract_path)
+        new_fields = load_contract_fields(new_contract_path)
 
         # A breaking change is when any field from the old contract is missing in the new one.
         missing_fields = old_fields - new_fields
@@ -39,6 +87,12 @@ def detect_breaking_changes(old_contract_path, new_contract_path):
 
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "--write-sidecar":
+        for path in sys.argv[2:]:
+            write_fields_sidecar(path)
+            print(f"📝 Wrote {_sidecar_path(path)}")
+        sys.exit(0)
+
     if len(sys.argv) != 3:
         print("Usage: python breaking_change_detector.py <old_contract.yaml> <new_contract.yaml>")
         sys.exit(2)
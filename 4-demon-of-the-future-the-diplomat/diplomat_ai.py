@@ -5,15 +5,22 @@ An AI agent that demonstrates the "Diplomat" role.
 It reads raw data and human context, then uses the Gemini API to
 proactively generate a draft for a Silver-tier data contract.
 """
+import functools
+import hashlib
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterable
 
 import google.generativeai as genai
 from dotenv import load_dotenv
 from rich.console import Console
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader
+
 # --- Constants: Strong Pattern ---
 # Centralizing configuration makes the script easier to maintain.
 PROMPT_TEMPLATE = """
@@ -39,11 +46,23 @@ Your task is to create a high-quality draft for a Silver-tier data contract in Y
 {data_sample}
 ---
 """
+# Encoded once, for hashing the prompt into a cache key.
+PROMPT_TEMPLATE_BYTES = PROMPT_TEMPLATE.encode("utf-8")
 
 INPUT_DIR = Path("input")
 OUTPUT_FILE = Path("proposed_contract.yaml")
 CONTEXT_FILE = INPUT_DIR / "context.txt"
 DATA_SAMPLE_FILE = INPUT_DIR / "data_sample.json"
+# Markdown fences around the YAML block in the AI's response.
+YAML_FENCE_OPEN = "```yaml"
+YAML_FENCE_CLOSE = "```"
+# The same fences, encoded once for scanning the streamed response bytes.
+YAML_FENCE_OPEN_BYTES = YAML_FENCE_OPEN.encode("utf-8")
+YAML_FENCE_CLOSE_BYTES = YAML_FENCE_CLOSE.encode("utf-8")
+# Offset from the opening fence to the YAML block: the fence plus its newline.
+YAML_BLOCK_OFFSET = len(YAML_FENCE_OPEN) + 1
+# Validated AI responses, keyed on a hash of the model and the prompt sent to it.
+CACHE_DIR = Path(".cache") / "diplomat"
 
 # --- Core Logic as a Class: Strong Pattern ---
 # Encapsulating the logic in a class improves structure and testability.
@@ -68,12 +87,12 @@ class DiplomatAI:
     def _extract_yaml_from_response(self, response_text: str) -> str:
         """Extracts the YAML code block from the LLM's raw response."""
         try:
-            start = response_text.index("```yaml") + len("```yaml\n")
-            end = response_text.index("```", start)
+            start = response_text.index(YAML_FENCE_OPEN) + YAML_BLOCK_OFFSET
+            end = response_text.index(YAML_FENCE_CLOSE, start)
             yaml_content = response_text[start:end].strip()
 
             # Self-validation to ensure the extracted content is valid YAML
-            yaml.safe_load(yaml_content)
+            yaml.load(yaml_content, Loader=SafeLoader)
 
             return yaml_content
         except yaml.YAMLError as e:
@@ -81,6 +100,56 @@ class DiplomatAI:
         except ValueError:
             raise ValueError("Could not find a valid YAML block (```yaml ... ```) in the AI's response.")
 
+    def _extract_yaml_from_stream(self, chunks: Iterable[str]) -> str:
+        """
+        Extracts the YAML code block from a streamed LLM response.
+
+        Stops consuming the stream as soon as the block's closing fence arrives,
+        instead of waiting for the model to finish generating.
+        """
+        buffer = bytearray()
+        block_start = -1
+
+        for chunk in chunks:
+            # A fence may straddle two chunks, so rescan the tail of the previous one.
+            scan_from = max(len(buffer) - len(YAML_FENCE_OPEN_BYTES), 0)
+            buffer += chunk.encode()
+
+            if block_start < 0:
+                fence = buffer.find(YAML_FENCE_OPEN_BYTES, scan_from)
+                if fence < 0:
+                    continue
+                block_start = scan_from = fence + len(YAML_FENCE_OPEN_BYTES)
+
+            if buffer.find(YAML_FENCE_CLOSE_BYTES, max(scan_from, block_start)) >= 0:
+                break
+
+        return self._extract_yaml_from_response(buffer.decode())
+
+    def _cache_file_for(self, inputs: Dict[str, str]) -> Path:
+        """Returns the cache file for a prompt: the model, the prompt template and its inputs."""
+        key = hashlib.blake2b(digest_size=16)
+        for part in (
+            getattr(self.model, "model_name", "").encode(),
+            PROMPT_TEMPLATE_BYTES,
+            inputs["context"].encode(),
+            inputs["data_sample"].encode(),
+        ):
+            key.update(part)
+            key.update(b"\0")
+        return CACHE_DIR / f"{key.hexdigest()}.yaml"
+
+    @staticmethod
+    def _write_cache(cache_file: Path, content: str) -> None:
+        """Writes a cache entry atomically, so an interrupted run never leaves a truncated file."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(content)
+            tmp_file.replace(cache_file)
+        except OSError:  # Best-effort; the next run just asks the model again
+            pass
+
     def generate_contract(self) -> str:
         """The main method to generate the contract."""
         console = Console()
@@ -90,18 +159,29 @@ class DiplomatAI:
 
         prompt = PROMPT_TEMPLATE.format(**inputs)
 
+        # Identical inputs get an identical answer: skip the API round trip (and its cost).
+        cache_file = self._cache_file_for(inputs)
+        if cache_file.is_file():
+            console.print(f"♻️  Reusing the cached AI response from [cyan]{cache_file}[/cyan]...")
+            return cache_file.read_text()
+
         console.print("🤖 Querying the Gemini API...")
-        response = self.model.generate_content(prompt)
+        response = self.model.generate_content(prompt, stream=True)
 
         console.print("📝 Processing AI response and extracting YAML...")
-        proposed_yaml = self._extract_yaml_from_response(response.text)
+        proposed_yaml = self._extract_yaml_from_stream(chunk.text for chunk in response)
 
+        self._write_cache(cache_file, proposed_yaml)
         return proposed_yaml
 
 # --- Setup and Execution ---
 
+@functools.cache
 def configure_gemini() -> genai.GenerativeModel:
-    """Configures and returns a Gemini model instance from environment variables."""
+    """
+    Configures and returns a Gemini model instance from environment variables.
+    The result is cached, so long-running processes (notebooks, services) set it up only once.
+    """
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY")
     model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash-latest") # Default model